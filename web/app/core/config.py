@@ -25,6 +25,12 @@ class Settings(BaseSettings):
     jwt_access_expire_minutes: int = 60
     jwt_refresh_expire_days: int = 30
 
+    # Password hashing (argon2id; legacy bcrypt hashes are upgraded on login)
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB (64 MiB)
+    # Fixed, not derived from the host: argon2 hashes encode their parameters
+    argon2_parallelism: int = 2
+
     # TTS Relay
     tts_relay_url: str = "http://localhost:9800"
     tts_relay_api_key: str = ""
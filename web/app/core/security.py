@@ -1,5 +1,8 @@
 """JWT token creation/validation and password hashing."""
 
+import hashlib
+import hmac
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -8,19 +11,37 @@ from passlib.context import CryptContext
 
 from web.app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2id for new hashes; bcrypt stays verifiable but is marked deprecated so
+# existing hashes get upgraded on the next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
 
 
 def hash_password(password: str) -> str:
-    """Hash a password with bcrypt."""
+    """Hash a password with argon2id."""
     return pwd_context.hash(password)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    """Verify a password against its hash."""
+    """Verify a password against its hash (argon2id or legacy bcrypt)."""
     return pwd_context.verify(plain, hashed)
 
 
+def password_needs_rehash(hashed: str) -> bool:
+    """True if the hash uses a deprecated scheme (i.e. legacy bcrypt).
+
+    argon2 hashes whose cost parameters differ from the current settings are
+    left alone, so tuning the parameters doesn't rewrite every hash on login.
+    """
+    return pwd_context.identify(hashed) != pwd_context.default_scheme()
+
+
 def create_access_token(
     subject: str,
     expires_delta: Optional[timedelta] = None,
@@ -61,9 +82,23 @@ def create_reset_token(subject: str) -> str:
     )
 
 
+# Verified tokens -> (subject, exp). Keyed by a digest of the token (never the
+# token itself) plus the expected type; entries die with the token's own exp.
+_token_cache: dict[tuple[bytes, str], tuple[str, float]] = {}
+_TOKEN_CACHE_MAX = 4096
+
+
+def clear_token_cache() -> None:
+    """Drop every cached token verification."""
+    _token_cache.clear()
+
+
 def decode_token(token: str, expected_type: str = "access") -> Optional[str]:
     """Decode and validate a JWT token.
 
+    Successful verifications are cached until the token expires, so repeat
+    requests with the same bearer token skip the signature check.
+
     Args:
         token: The JWT string.
         expected_type: Expected token type ("access", "refresh", "reset").
@@ -71,10 +106,26 @@ def decode_token(token: str, expected_type: str = "access") -> Optional[str]:
     Returns:
         The subject (user ID) if valid, None otherwise.
     """
+    key = (hashlib.blake2b(token.encode(), digest_size=16).digest(), expected_type)
+    cached = _token_cache.get(key)
+    if cached is not None:
+        subject, exp = cached
+        if time.time() < exp:
+            return subject
+        _token_cache.pop(key, None)
+        return None
+
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
-        if payload.get("type") != expected_type:
-            return None
-        return payload.get("sub")
     except JWTError:
         return None
+    token_type = str(payload.get("type", ""))
+    if not hmac.compare_digest(token_type.encode(), expected_type.encode()):
+        return None
+
+    subject, exp = payload.get("sub"), payload.get("exp")
+    if subject is not None and exp is not None:
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            _token_cache.pop(next(iter(_token_cache)))
+        _token_cache[key] = (subject, float(exp))
+    return subject
@@ -26,6 +26,9 @@ async def lifespan(app: FastAPI):
     logger.info("Voice Studio starting up...")
     await init_db()
     logger.info("Database initialized")
+    # Build the OpenAPI schema now (it walks every request/response model's
+    # JSON schema) rather than on the first /docs or /openapi.json hit.
+    app.openapi()
     yield
     await close_client()
     logger.info("Voice Studio shut down")
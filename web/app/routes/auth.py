@@ -13,6 +13,7 @@ from web.app.core.security import (
     create_reset_token,
     decode_token,
     hash_password,
+    password_needs_rehash,
     verify_password,
 )
 from web.app.core.config import settings
@@ -109,6 +110,11 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is disabled")
 
+    # Upgrade legacy bcrypt hashes while we have the plaintext
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = hash_password(body.password)
+        await db.commit()
+
     return TokenResponse(
         access_token=create_access_token(user.id),
         refresh_token=create_refresh_token(user.id),
@@ -122,8 +128,7 @@ async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_db)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
 
@@ -160,8 +165,7 @@ async def reset_confirm(body: ResetConfirmBody, db: AsyncSession = Depends(get_d
     if not user_id:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=400, detail="Invalid reset token")
 
@@ -178,8 +182,7 @@ async def verify_email(token: str, db: AsyncSession = Depends(get_db)):
     if not user_id:
         raise HTTPException(status_code=400, detail="Invalid or expired verification token")
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=400, detail="Invalid token")
 
@@ -47,8 +47,24 @@ def _truncate(text: str, length: int = _TEXT_TRUNCATE) -> str:
     return text[:length] + "…" if len(text) > length else text
 
 
+# Base64 chars to decode when reading only the WAV header (3 KiB of bytes —
+# room for fmt plus typical LIST/fact chunks ahead of data).
+_WAV_HEADER_B64_CHARS = 4096
+
+
 def _wav_duration(audio_b64: str) -> Optional[float]:
-    """Compute duration in seconds from base64-encoded WAV audio."""
+    """Compute duration in seconds from base64-encoded WAV audio.
+
+    The frame count comes from the data chunk's declared size, so only the
+    header is decoded; the full payload is decoded only if the header runs
+    past the prefix.
+    """
+    try:
+        wav_bytes = base64.b64decode(audio_b64[:_WAV_HEADER_B64_CHARS])
+        with wave.open(io.BytesIO(wav_bytes)) as wf:
+            return round(wf.getnframes() / wf.getframerate(), 3)
+    except Exception:
+        pass
     try:
         wav_bytes = base64.b64decode(audio_b64)
         with wave.open(io.BytesIO(wav_bytes)) as wf:
@@ -97,8 +113,7 @@ async def _generate_draft_audio(draft_id: str) -> None:
     async with async_session() as db:
         try:
             # Fetch draft
-            result = await db.execute(select(Draft).where(Draft.id == draft_id))
-            draft = result.scalar_one_or_none()
+            draft = await db.get(Draft, draft_id)
             if draft is None:
                 logger.error("Background task: draft %s not found", draft_id)
                 return
@@ -135,8 +150,7 @@ async def _generate_draft_audio(draft_id: str) -> None:
         except TTSRelayError as exc:
             logger.error("Draft %s TTS error: %s", draft_id, exc.detail)
             try:
-                result = await db.execute(select(Draft).where(Draft.id == draft_id))
-                draft = result.scalar_one_or_none()
+                draft = await db.get(Draft, draft_id)
                 if draft:
                     draft.status = DRAFT_STATUS_FAILED
                     draft.error = f"TTS relay error ({exc.status_code}): {exc.detail}"
@@ -147,8 +161,7 @@ async def _generate_draft_audio(draft_id: str) -> None:
         except Exception as exc:
             logger.error("Draft %s generation failed: %s", draft_id, exc)
             try:
-                result = await db.execute(select(Draft).where(Draft.id == draft_id))
-                draft = result.scalar_one_or_none()
+                draft = await db.get(Draft, draft_id)
                 if draft:
                     draft.status = DRAFT_STATUS_FAILED
                     draft.error = str(exc)
@@ -295,10 +308,7 @@ async def get_draft(
 
     character_name = None
     if draft.character_id:
-        char_result = await db.execute(
-            select(Character).where(Character.id == draft.character_id)
-        )
-        char = char_result.scalar_one_or_none()
+        char = await db.get(Character, draft.character_id)
         if char:
             character_name = char.name
 
@@ -124,10 +124,7 @@ async def get_template(
         raise HTTPException(status_code=404, detail="Template not found")
 
     character_name = None
-    char_result = await db.execute(
-        select(Character).where(Character.id == template.character_id)
-    )
-    char = char_result.scalar_one_or_none()
+    char = await db.get(Character, template.character_id)
     if char:
         character_name = char.name
 
@@ -158,10 +155,7 @@ async def rename_template(
     await db.refresh(template)
 
     character_name = None
-    char_result = await db.execute(
-        select(Character).where(Character.id == template.character_id)
-    )
-    char = char_result.scalar_one_or_none()
+    char = await db.get(Character, template.character_id)
     if char:
         character_name = char.name
 
@@ -3,7 +3,8 @@
 These thin wrappers add auth and then delegate to the TTS relay.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from web.app.models.user import User
@@ -19,6 +20,49 @@ def _relay_or_raise(e: TTSRelayError):
     raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 
+async def _conditional_get(path: str, request: Request) -> Response:
+    """Proxy a GET with ETag revalidation — 304 with no body if the client is current."""
+    body, etag = await tts_proxy.tts_get_conditional(path, request.headers.get("if-none-match"))
+    headers = {"ETag": etag} if etag else None
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(body, headers=headers)
+
+
+# Synthesize bodies are a prompt name plus text — far below this.
+_MAX_PASSTHROUGH_BODY = 1024 * 1024
+
+
+async def _read_passthrough_body(request: Request) -> bytes:
+    """Read a JSON body for forwarding, rejecting non-JSON or oversized ones.
+
+    The size limit is enforced while streaming, so a body without a usable
+    Content-Length is never buffered past ``_MAX_PASSTHROUGH_BODY``.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip().lower() != "application/json":
+        raise HTTPException(status_code=415, detail="Request body must be application/json")
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > _MAX_PASSTHROUGH_BODY:
+        raise HTTPException(status_code=413, detail="Request body too large")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > _MAX_PASSTHROUGH_BODY:
+            raise HTTPException(status_code=413, detail="Request body too large")
+    return bytes(body)
+
+
+def _json_body(model: type[BaseModel]) -> dict:
+    """OpenAPI request-body spec for passthrough routes that take a raw Request."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
 # ── Status ──────────────────────────────────────────────────────────
 
 
@@ -65,21 +109,22 @@ async def warmup(user: User = Depends(get_current_user)):
 
 
 @router.get("/voices/characters")
-async def list_characters(user: User = Depends(get_current_user)):
-    """List all characters in the GPU voice library."""
-    return await tts_proxy.tts_get("/api/v1/voices/characters")
+async def list_characters(request: Request, user: User = Depends(get_current_user)):
+    """List all characters in the GPU voice library (supports If-None-Match)."""
+    return await _conditional_get("/api/v1/voices/characters", request)
 
 
 @router.get("/voices/prompts")
 async def list_prompts(
+    request: Request,
     tags: str | None = Query(None),
     user: User = Depends(get_current_user),
 ):
-    """List all voice prompts, optionally filtered by tags."""
+    """List all voice prompts, optionally filtered by tags (supports If-None-Match)."""
     path = "/api/v1/voices/prompts"
     if tags:
         path += f"?tags={tags}"
-    return await tts_proxy.tts_get(path)
+    return await _conditional_get(path, request)
 
 
 @router.get("/voices/prompts/search")
@@ -108,9 +153,9 @@ async def search_prompts(
 
 
 @router.get("/voices/emotions")
-async def list_emotions(user: User = Depends(get_current_user)):
-    """List available emotion presets and modes."""
-    return await tts_proxy.tts_get("/api/v1/voices/emotions")
+async def list_emotions(request: Request, user: User = Depends(get_current_user)):
+    """List available emotion presets and modes (supports If-None-Match)."""
+    return await _conditional_get("/api/v1/voices/emotions", request)
 
 
 # ── Voice Library (write) ───────────────────────────────────────────
@@ -172,17 +217,24 @@ async def delete_prompt(name: str, user: User = Depends(get_current_user)):
 
 
 class SynthesizeRequest(BaseModel):
+    """Documents the /synthesize body — the route forwards it unparsed."""
     voice_prompt: str
     text: str
     language: str = "Auto"
     format: str = "wav"
 
 
-@router.post("/synthesize")
-async def synthesize(body: SynthesizeRequest, user: User = Depends(get_current_user)):
-    """Synthesize text using a saved clone prompt."""
+@router.post("/synthesize", openapi_extra=_json_body(SynthesizeRequest))
+async def synthesize(request: Request, user: User = Depends(get_current_user)):
+    """Synthesize text using a saved clone prompt.
+
+    The body is passed through to the relay as-is; the relay validates it and
+    applies the same defaults as ``SynthesizeRequest``.  Only the content type
+    and size are checked here.
+    """
+    raw = await _read_passthrough_body(request)
     try:
-        return await tts_proxy.tts_post("/api/v1/tts/clone-prompt", body.model_dump())
+        return await tts_proxy.tts_post_passthrough("/api/v1/tts/clone-prompt", raw)
     except TTSRelayError as e:
         _relay_or_raise(e)
 
@@ -315,9 +367,9 @@ async def normalize_audio(body: NormalizeRequest, user: User = Depends(get_curre
 
 
 @router.get("/voices/{voice_id}/package")
-async def export_package(voice_id: str, user: User = Depends(get_current_user)):
-    """Export a voice as a self-contained package."""
-    return await tts_proxy.tts_get(f"/api/v1/tts/voices/{voice_id}/package")
+async def export_package(voice_id: str, request: Request, user: User = Depends(get_current_user)):
+    """Export a voice as a self-contained package (supports If-None-Match)."""
+    return await _conditional_get(f"/api/v1/tts/voices/{voice_id}/package", request)
 
 
 @router.post("/voices/import")
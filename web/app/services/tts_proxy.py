@@ -1,7 +1,10 @@
 """TTS relay proxy — forwards requests to the GPU relay server."""
 
+import hashlib
+import json
 import logging
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Iterator
 
 import httpx
 
@@ -46,60 +49,126 @@ def _handle_error(resp: httpx.Response) -> None:
     raise TTSRelayError(resp.status_code, detail)
 
 
+@contextmanager
+def _relay_errors() -> Iterator[None]:
+    """Map relay connection failures and timeouts to TTSRelayError."""
+    try:
+        yield
+    except httpx.ConnectError:
+        raise TTSRelayError(502, "Cannot connect to TTS relay — server may be down")
+    except httpx.TimeoutException:
+        raise TTSRelayError(504, "TTS relay timed out — GPU may be cold-starting")
+
+
 async def tts_get(path: str, params: dict | None = None) -> dict:
     """GET request to TTS relay."""
-    try:
+    with _relay_errors():
         client = _get_client()
         resp = await client.get(path, params=params)
         _handle_error(resp)
         return resp.json()
-    except httpx.ConnectError:
-        raise TTSRelayError(502, "Cannot connect to TTS relay — server may be down")
-    except httpx.TimeoutException:
-        raise TTSRelayError(504, "TTS relay timed out — GPU may be cold-starting")
+
+
+def _weak_etag(content: bytes) -> str:
+    """Derive a weak ETag from a response body."""
+    return f'W/"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def _if_none_match_tags(if_none_match: str) -> list[str]:
+    """Split an If-None-Match header value into its entity tags."""
+    return [t.strip() for t in if_none_match.split(",") if t.strip()]
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header value."""
+    def opaque(tag: str) -> str:
+        return tag.removeprefix("W/")
+
+    tags = _if_none_match_tags(if_none_match)
+    return any(t == "*" or opaque(t) == opaque(etag) for t in tags)
+
+
+async def tts_get_conditional(
+    path: str, if_none_match: str | None = None,
+) -> tuple[dict | None, str | None]:
+    """Conditional GET for rarely-changing voice-library listings.
+
+    Forwards ``If-None-Match`` to the relay.  Returns ``(None, etag)`` when the
+    caller's copy is current — either the relay answered 304 or the tag matches
+    the fresh body — otherwise ``(body, etag)``.  If the relay sends no ETag,
+    a weak one is derived from the body so clients can still revalidate.  A
+    relay 304 without an ETag echoes the caller's tag only when it sent exactly
+    one (never a list or ``*``, which aren't valid ETag values).
+    """
+    headers = {"If-None-Match": if_none_match} if if_none_match else None
+    with _relay_errors():
+        client = _get_client()
+        resp = await client.get(path, headers=headers)
+        if resp.status_code == 304:
+            etag = resp.headers.get("etag")
+            if etag is None and if_none_match:
+                tags = _if_none_match_tags(if_none_match)
+                etag = tags[0] if len(tags) == 1 and tags[0] != "*" else None
+            return None, etag
+        _handle_error(resp)
+        etag = resp.headers.get("etag") or _weak_etag(resp.content)
+        if if_none_match and _etag_matches(etag, if_none_match):
+            return None, etag
+        return resp.json(), etag
+
+
+def _json_or_raise(resp: httpx.Response, path: str) -> dict:
+    """Decode a relay JSON body, raising TTSRelayError(502) on non-JSON content."""
+    try:
+        return resp.json()
+    except json.JSONDecodeError:
+        # Relay returned non-JSON (e.g. unexpected binary audio).  Surface a
+        # clear error instead of letting the JSONDecodeError bubble up as a
+        # 500 Internal Server Error.
+        ct = resp.headers.get("content-type", "unknown")
+        logger.error(
+            "TTS relay returned non-JSON response for POST %s: content-type=%s len=%d",
+            path, ct, len(resp.content),
+        )
+        raise TTSRelayError(
+            502,
+            f"TTS relay returned unexpected binary/non-JSON response "
+            f"(content-type: {ct}). This is a relay bug — audio endpoints "
+            f"should return JSON with base64-encoded audio.",
+        )
 
 
 async def tts_post(path: str, body: dict | None = None) -> dict:
     """POST request to TTS relay."""
-    import json as _json
-    try:
+    with _relay_errors():
         client = _get_client()
         resp = await client.post(path, json=body)
         _handle_error(resp)
-        try:
-            return resp.json()
-        except _json.JSONDecodeError:
-            # Relay returned non-JSON (e.g. unexpected binary audio).  Surface a
-            # clear error instead of letting the JSONDecodeError bubble up as a
-            # 500 Internal Server Error.
-            ct = resp.headers.get("content-type", "unknown")
-            logger.error(
-                "TTS relay returned non-JSON response for POST %s: content-type=%s len=%d",
-                path, ct, len(resp.content),
-            )
-            raise TTSRelayError(
-                502,
-                f"TTS relay returned unexpected binary/non-JSON response "
-                f"(content-type: {ct}). This is a relay bug — audio endpoints "
-                f"should return JSON with base64-encoded audio.",
-            )
-    except httpx.ConnectError:
-        raise TTSRelayError(502, "Cannot connect to TTS relay — server may be down")
-    except httpx.TimeoutException:
-        raise TTSRelayError(504, "TTS relay timed out — GPU may be cold-starting")
+        return _json_or_raise(resp, path)
+
+
+async def tts_post_passthrough(path: str, raw: bytes) -> dict:
+    """POST an already-encoded JSON body to the TTS relay unchanged.
+
+    For routes that only forward: the raw JSON bytes go straight to the relay,
+    skipping the parse → validate → model_dump → re-encode round trip (which
+    matters for payloads carrying large base64 audio).  The relay validates
+    the body and applies its own defaults.
+    """
+    with _relay_errors():
+        client = _get_client()
+        resp = await client.post(path, content=raw, headers={"content-type": "application/json"})
+        _handle_error(resp)
+        return _json_or_raise(resp, path)
 
 
 async def tts_delete(path: str) -> dict:
     """DELETE request to TTS relay."""
-    try:
+    with _relay_errors():
         client = _get_client()
         resp = await client.delete(path)
         _handle_error(resp)
         return resp.json()
-    except httpx.ConnectError:
-        raise TTSRelayError(502, "Cannot connect to TTS relay — server may be down")
-    except httpx.TimeoutException:
-        raise TTSRelayError(504, "TTS relay timed out — GPU may be cold-starting")
 
 
 async def close_client() -> None:
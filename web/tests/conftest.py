@@ -1,26 +1,81 @@
 """Test fixtures for the Voice Studio web backend.
 
-Uses SQLite in-memory for tests — no Postgres needed.
+Uses SQLite in-memory for tests — no Postgres needed. The schema is created
+once per session; every test runs inside a transaction that is rolled back on
+teardown, so nothing a test writes is visible to the next one.
 """
 
-import asyncio
-from typing import AsyncGenerator
+import functools
+import os
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Awaitable, Callable, Mapping, NamedTuple
+from unittest.mock import AsyncMock
 
+import httpx
+import orjson
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
-from web.app.core.database import Base, get_db
-from web.app.main import app
+try:  # Optional dev tool — detects blocking calls made on the event loop
+    from blockbuster import blockbuster_ctx
+except ImportError:
+    blockbuster_ctx = None
+
+try:  # Faster event loop for the suite; not available on Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Minimum argon2 cost — must be set before the app (and its CryptContext)
+# is imported.
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "8")
+os.environ.setdefault("ARGON2_PARALLELISM", "1")
+
+from web.app.core import security  # noqa: E402
+from web.app.core.config import settings  # noqa: E402
+from web.app.core.database import Base, get_db  # noqa: E402
+from web.app.main import app  # noqa: E402
+from web.app.models.draft import Draft  # noqa: E402
+from web.app.models.user import User  # noqa: E402
+from web.app.services import tts_proxy  # noqa: E402
 
 # Use SQLite for testing (async via aiosqlite)
 TEST_DB_URL = "sqlite+aiosqlite:///:memory:"
 
-test_engine = create_async_engine(TEST_DB_URL, echo=False)
+# StaticPool keeps the single in-memory database alive across every checkout;
+# aiosqlite runs it on a worker thread, hence check_same_thread=False.
+# The compiled-statement cache is sized above SQLAlchemy's default (500) so
+# the suite's near-identical queries stay compiled for the whole session.
+test_engine = create_async_engine(
+    TEST_DB_URL,
+    echo=False,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+    pool_pre_ping=False,
+    query_cache_size=1200,
+)
 test_session = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
 
 
+# aiosqlite defers BEGIN until the first DML statement, which breaks SAVEPOINTs.
+# Take over transaction control so the per-test outer transaction really
+# encloses everything a test does (see SQLAlchemy's SQLite dialect docs).
+@event.listens_for(test_engine.sync_engine, "connect")
+def _sqlite_connect(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine.sync_engine, "begin")
+def _sqlite_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
     async with test_session() as session:
         yield session
@@ -28,49 +83,347 @@ async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
 
 app.dependency_overrides[get_db] = override_get_db
 
+# One ASGI transport for the whole session — the app and its middleware stack
+# are wired once; per-test isolation comes from setup_db's rollback.
+_TRANSPORT = ASGITransport(app=app)
 
-@pytest.fixture(scope="session")
-def event_loop():
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
 
+if uvloop is not None:
 
-@pytest_asyncio.fixture(autouse=True)
-async def setup_db():
-    """Create tables before each test, drop after."""
+    def pytest_asyncio_loop_factories(config, item):
+        """Run the web tests on uvloop where it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(autouse=True)
+def no_blocking_calls():
+    """Fail any test whose code makes a blocking I/O call on the event loop.
+
+    No-op when blockbuster isn't installed.
+    """
+    if blockbuster_ctx is None:
+        yield
+        return
+    with blockbuster_ctx() as bb:
+        yield bb
+
+
+@pytest.fixture(scope="session", autouse=True)
+def null_mailer():
+    """Stub out outgoing email for the whole session — tests never reach Resend."""
+    with pytest.MonkeyPatch.context() as mp:
+        for module in ("web.app.core.email", "web.app.routes.auth"):
+            for name in ("send_password_reset", "send_verification_email"):
+                mp.setattr(f"{module}.{name}", AsyncMock(return_value=True))
+        yield
+
+
+@pytest.fixture(autouse=True)
+def restore_runtime_settings(monkeypatch):
+    """PATCH /api/v1/config mutates the settings singleton — undo it per test."""
+    for name in ("llm_provider", "llm_model"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def create_schema():
+    """Create all tables once for the whole session."""
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    await test_engine.dispose()
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(autouse=True)
+async def setup_db() -> AsyncGenerator[async_sessionmaker, None]:
+    """Wrap each test in a transaction that is rolled back afterwards.
+
+    Sessions join the outer transaction in ``create_savepoint`` mode, so a
+    route's ``await db.commit()`` only releases a SAVEPOINT. Yields the
+    sessionmaker bound to the test's connection.
+    """
+    async with test_engine.connect() as conn:
+        await conn.begin()
+        sessionmaker = async_sessionmaker(
+            bind=conn,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+
+        async def _override_get_db() -> AsyncGenerator[AsyncSession, None]:
+            async with sessionmaker() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _override_get_db
+        yield sessionmaker
+        app.dependency_overrides[get_db] = override_get_db
+        await conn.rollback()
+
+
+class ORJSONAsyncClient(AsyncClient):
+    """AsyncClient that serialises ``json=`` request bodies with orjson."""
+
+    def build_request(self, method, url, *, content=None, json=None, headers=None, **kwargs):
+        if json is not None:
+            content = orjson.dumps(json)
+            headers = {**(headers or {}), "content-type": "application/json"}
+            json = None
+        return super().build_request(
+            method, url, content=content, json=json, headers=headers, **kwargs,
+        )
+
+
+@pytest_asyncio.fixture(scope="session")
 async def client() -> AsyncGenerator[AsyncClient, None]:
-    """Async test client for the FastAPI app."""
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as c:
+    """Async test client for the FastAPI app, shared by the whole session.
+
+    ``json=`` bodies are encoded with orjson.
+    """
+    async with ORJSONAsyncClient(transport=_TRANSPORT, base_url="http://test") as c:
         yield c
 
 
 @pytest_asyncio.fixture
-async def db_session() -> AsyncGenerator[AsyncSession, None]:
-    """Yield the test DB session for direct model manipulation in tests."""
-    async with test_session() as session:
+async def db_session(setup_db: async_sessionmaker) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session inside the test's transaction for direct model manipulation."""
+    async with setup_db() as session:
         yield session
 
 
+def _bearer(user_id: str) -> Mapping[str, str]:
+    """Read-only auth headers for ``user_id``.
+
+    Session-scoped headers are shared by every test, so they are frozen;
+    extend them with ``{**headers, ...}`` instead of mutating.
+    """
+    return MappingProxyType({"Authorization": "Bearer " + security.create_access_token(user_id)})
+
+
+async def _insert_session_user(email: str, password: str) -> Mapping[str, str]:
+    """Commit a user outside any test transaction and mint its access token."""
+    async with test_session() as session:
+        user = User(email=email, password_hash=_password_hash(password), is_verified=True)
+        session.add(user)
+        await session.commit()
+    return _bearer(user.id)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def auth_headers() -> Mapping[str, str]:
+    """Insert the primary test user once and return its auth headers.
+
+    Session fixtures are set up before ``setup_db`` opens a test's
+    transaction, so the user is committed for real and survives every
+    rollback. Changes a test makes to it (password, email, deletion) are
+    rolled back with the rest of that test. The password is real, so account
+    tests can still log in with it.
+    """
+    return await _insert_session_user("test@example.com", "testpassword123")
+
+
+@pytest.fixture(scope="session")
+def auth_user_id(auth_headers: Mapping[str, str]) -> str:
+    """ID of the primary test user behind ``auth_headers``."""
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    return security.decode_token(token)
+
+
 @pytest_asyncio.fixture
-async def auth_headers(client: AsyncClient) -> dict:
-    """Register a test user and return auth headers."""
-    await client.post("/auth/register", json={
-        "email": "test@example.com",
-        "password": "testpassword123",
-    })
-    resp = await client.post("/auth/login", json={
-        "email": "test@example.com",
-        "password": "testpassword123",
-    })
-    token = resp.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+async def make_user(
+    db_session: AsyncSession,
+) -> Callable[[str], Awaitable[Mapping[str, str]]]:
+    """Factory: insert a user directly and return auth headers for it.
+
+    For tests where the auth flow is not under test — skips register/login
+    and mints the access token with the app's own helper. The stored hash is
+    a placeholder, so these users cannot log in with a password.
+    """
+    async def _make_user(email: str) -> Mapping[str, str]:
+        user = User(email=email, password_hash="!", is_verified=True)
+        db_session.add(user)
+        await db_session.commit()
+        return _bearer(user.id)
+
+    return _make_user
+
+
+@pytest_asyncio.fixture(scope="session")
+async def second_user_headers() -> Mapping[str, str]:
+    """Auth headers for a second, independent user (cross-user isolation tests).
+
+    Inserted once per session, like ``auth_headers``.
+    """
+    return await _insert_session_user("second@example.com", "password123")
+
+
+@functools.cache
+def _password_hash(password: str) -> str:
+    """Hash each distinct test password once per session."""
+    return security.hash_password(password)
+
+
+@pytest_asyncio.fixture
+async def seed_user(db_session: AsyncSession) -> Callable[[str, str], Awaitable[None]]:
+    """Factory: insert a user that can log in with the given password.
+
+    Replaces a ``/auth/register`` call in tests that only need an account to
+    exist before exercising login/refresh.
+    """
+    async def _seed_user(email: str, password: str) -> None:
+        db_session.add(User(email=email, password_hash=_password_hash(password)))
+        await db_session.commit()
+
+    return _seed_user
+
+
+@pytest_asyncio.fixture
+async def make_drafts(db_session: AsyncSession) -> Callable[..., Awaitable[list[Draft]]]:
+    """Factory: bulk-insert ``n`` drafts for a user, bypassing the create route.
+
+    Keyword overrides are applied to every draft (e.g. ``character_id``).
+    """
+    async def _make_drafts(user_id: str, n: int, **overrides) -> list[Draft]:
+        fields = {
+            "preset_name": "angry",
+            "preset_type": "emotion",
+            "intensity": "medium",
+            "text": "Hello, I am furious about this!",
+            "instruct": "Speak with controlled anger, sharp consonants",
+            **overrides,
+        }
+        drafts = [Draft(user_id=user_id, **fields) for _ in range(n)]
+        db_session.add_all(drafts)
+        await db_session.commit()
+        return drafts
+
+    return _make_drafts
+
+
+class RecordedCall(NamedTuple):
+    """One recorded call; indexes like ``mock.call_args`` (``[0]`` args, ``[1]`` kwargs)."""
+
+    args: tuple
+    kwargs: dict
+
+
+class AsyncCallRecorder:
+    """Minimal awaitable stand-in for ``AsyncMock``.
+
+    Records each call, then raises ``side_effect`` if it is an exception,
+    returns ``side_effect(*args, **kwargs)`` if it is callable, and otherwise
+    returns ``return_value``. No child mocks or signature introspection.
+    """
+
+    def __init__(self, return_value: Any = None, side_effect: Any = None):
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.call_args_list: list[RecordedCall] = []
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        self.call_args_list.append(RecordedCall(args, kwargs))
+        effect = self.side_effect
+        if isinstance(effect, BaseException) or (
+            isinstance(effect, type) and issubclass(effect, BaseException)
+        ):
+            raise effect
+        if callable(effect):
+            return effect(*args, **kwargs)
+        return self.return_value
+
+    @property
+    def call_args(self) -> RecordedCall | None:
+        return self.call_args_list[-1] if self.call_args_list else None
+
+    @property
+    def call_count(self) -> int:
+        return len(self.call_args_list)
+
+    def assert_called_once(self) -> None:
+        assert self.call_count == 1, f"Expected 1 call, got {self.call_count}"
+
+    def assert_called_once_with(self, *args, **kwargs) -> None:
+        self.assert_called_once()
+        assert self.call_args == (args, kwargs), f"Called with {self.call_args}"
+
+    def reset(self) -> None:
+        """Forget recorded calls and clear return_value/side_effect."""
+        self.return_value = None
+        self.side_effect = None
+        self.call_args_list.clear()
+
+
+@pytest.fixture(scope="module")
+def _proxy_recorders() -> defaultdict[str, AsyncCallRecorder]:
+    """One recorder per ``tts_proxy`` function, built once per module."""
+    return defaultdict(AsyncCallRecorder)
+
+
+@pytest.fixture
+def mock_proxy(
+    monkeypatch, _proxy_recorders: defaultdict[str, AsyncCallRecorder],
+) -> Callable[..., AsyncCallRecorder]:
+    """Install the module's recorder for a ``tts_proxy`` function in this test.
+
+    ``mock_proxy(name, return_value)`` resets and returns the recorder;
+    monkeypatch puts the real function back at teardown.
+    """
+    def _mock_proxy(name: str, return_value: Any = None) -> AsyncCallRecorder:
+        recorder = _proxy_recorders[name]
+        recorder.reset()
+        recorder.return_value = return_value
+        monkeypatch.setattr(tts_proxy, name, recorder)
+        return recorder
+
+    return _mock_proxy
+
+
+class RelayMock:
+    """Canned TTS relay served through ``httpx.MockTransport``.
+
+    Register a response per path with ``expect``; every request the proxy
+    sends is kept in ``calls``. Paths with no response get a 404.
+    """
+
+    def __init__(self):
+        self._responses: dict[str, tuple[int, dict]] = {}
+        self.calls: list[httpx.Request] = []
+        self.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self._handle), base_url="http://relay.test",
+        )
+
+    def expect(self, path: str, json: Any = None, *, status: int = 200, **response_kwargs) -> None:
+        """Answer ``path`` with ``status`` and a JSON body (or ``content=``/``headers=``)."""
+        if json is not None:
+            response_kwargs["json"] = json
+        self._responses[path] = (status, response_kwargs)
+
+    def reset(self) -> None:
+        self._responses.clear()
+        self.calls.clear()
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        if request.url.path not in self._responses:
+            return httpx.Response(404, json={"detail": f"No relay mock for {request.url.path}"})
+        status, kwargs = self._responses[request.url.path]
+        return httpx.Response(status, **kwargs)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def _relay_mock() -> AsyncGenerator[RelayMock, None]:
+    relay = RelayMock()
+    yield relay
+    await relay.client.aclose()
+
+
+@pytest.fixture
+def relay_mock(monkeypatch, _relay_mock: RelayMock) -> RelayMock:
+    """Point ``tts_proxy``'s httpx client at a canned relay for this test.
+
+    Unlike ``mock_proxy`` the real proxy functions run, so status handling,
+    ETags and body forwarding are exercised end to end.
+    """
+    _relay_mock.reset()
+    monkeypatch.setattr(tts_proxy, "_get_client", lambda: _relay_mock.client)
+    return _relay_mock
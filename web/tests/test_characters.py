@@ -81,31 +81,10 @@ async def test_delete_character(client: AsyncClient, auth_headers: dict):
 
 
 @pytest.mark.asyncio
-async def test_unauthenticated_access(client: AsyncClient):
-    resp = await client.get("/api/v1/characters")
-    assert resp.status_code in (401, 403)  # No auth header
-
-
-@pytest.mark.asyncio
-async def test_user_isolation(client: AsyncClient):
+async def test_user_isolation(client: AsyncClient, make_user):
     """Users can only see their own characters."""
-    # Create user 1
-    await client.post("/auth/register", json={
-        "email": "user1@example.com", "password": "password123",
-    })
-    login1 = await client.post("/auth/login", json={
-        "email": "user1@example.com", "password": "password123",
-    })
-    headers1 = {"Authorization": f"Bearer {login1.json()['access_token']}"}
-
-    # Create user 2
-    await client.post("/auth/register", json={
-        "email": "user2@example.com", "password": "password123",
-    })
-    login2 = await client.post("/auth/login", json={
-        "email": "user2@example.com", "password": "password123",
-    })
-    headers2 = {"Authorization": f"Bearer {login2.json()['access_token']}"}
+    headers1 = await make_user("user1@example.com")
+    headers2 = await make_user("user2@example.com")
 
     # User 1 creates a character
     await client.post("/api/v1/characters", json={
@@ -33,8 +33,3 @@ async def test_update_config_invalid_provider(client: AsyncClient, auth_headers:
     }, headers=auth_headers)
     assert resp.status_code == 400
 
-
-@pytest.mark.asyncio
-async def test_config_unauthenticated(client: AsyncClient):
-    resp = await client.get("/api/v1/config")
-    assert resp.status_code in (401, 403)
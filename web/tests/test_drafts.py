@@ -6,19 +6,27 @@ without triggering actual audio generation.
 """
 
 import base64
-import io
 import struct
-import wave
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from web.app.routes import drafts as drafts_routes
+
 
 # ── Fixtures ──────────────────────────────────────────────────────────────────
 
+@pytest.fixture(autouse=True, scope="module")
+def _mock_generate():
+    """Never run background audio generation — it would call the GPU relay."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(drafts_routes, "_generate_draft_audio", AsyncMock())
+        yield
+
+
 async def _create_character(client: AsyncClient, auth_headers: dict) -> str:
     resp = await client.post("/api/v1/characters", json={
         "name": "Kira",
@@ -38,17 +46,35 @@ DRAFT_PAYLOAD = {
 }
 
 
-def _make_fake_audio_b64() -> str:
-    """Generate a minimal valid WAV file and return as base64."""
+def _build_fake_audio_b64() -> str:
+    """Build a one-second silent mono 16-bit WAV and return it as base64.
+
+    The 44-byte RIFF/WAVE header is packed by hand; samples are zero bytes.
+    """
     sample_rate = 22050
-    num_samples = sample_rate
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(struct.pack(f"<{num_samples}h", *([0] * num_samples)))
-    return base64.b64encode(buf.getvalue()).decode()
+    data = bytes(sample_rate * 2)
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(data), b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", len(data),
+    )
+    return base64.b64encode(header + data).decode()
+
+
+FAKE_AUDIO_B64 = _build_fake_audio_b64()
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def test_wav_duration_reads_header_only():
+    assert drafts_routes._wav_duration(FAKE_AUDIO_B64) == 1.0
+    # Truncated payload: the data chunk's declared size still gives the duration
+    assert drafts_routes._wav_duration(FAKE_AUDIO_B64[:drafts_routes._WAV_HEADER_B64_CHARS]) == 1.0
+
+
+def test_wav_duration_invalid_audio():
+    assert drafts_routes._wav_duration("bm90IGEgd2F2") is None
 
 
 # ── POST /api/v1/drafts ───────────────────────────────────────────────────────
@@ -56,8 +82,7 @@ def _make_fake_audio_b64() -> str:
 @pytest.mark.asyncio
 async def test_create_draft_no_character(client: AsyncClient, auth_headers: dict):
     """Draft created without character_id."""
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
+    resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
     assert resp.status_code == 201
     data = resp.json()["draft"]
     assert data["status"] == "pending"
@@ -71,8 +96,7 @@ async def test_create_draft_no_character(client: AsyncClient, auth_headers: dict
 async def test_create_draft_with_character(client: AsyncClient, auth_headers: dict):
     char_id = await _create_character(client, auth_headers)
     payload = {**DRAFT_PAYLOAD, "character_id": char_id}
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
+    resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
     assert resp.status_code == 201
     data = resp.json()["draft"]
     assert data["character_id"] == char_id
@@ -81,24 +105,21 @@ async def test_create_draft_with_character(client: AsyncClient, auth_headers: di
 @pytest.mark.asyncio
 async def test_create_draft_invalid_character(client: AsyncClient, auth_headers: dict):
     payload = {**DRAFT_PAYLOAD, "character_id": "nonexistent-id"}
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
+    resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
     assert resp.status_code == 404
 
 
 @pytest.mark.asyncio
 async def test_create_draft_missing_intensity_for_emotion(client: AsyncClient, auth_headers: dict):
     payload = {k: v for k, v in DRAFT_PAYLOAD.items() if k != "intensity"}
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
+    resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
     assert resp.status_code == 400
 
 
 @pytest.mark.asyncio
 async def test_create_draft_invalid_preset_type(client: AsyncClient, auth_headers: dict):
     payload = {**DRAFT_PAYLOAD, "preset_type": "unknown"}
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
+    resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
     assert resp.status_code == 400
 
 
@@ -111,8 +132,7 @@ async def test_create_draft_mode_no_intensity_required(client: AsyncClient, auth
         "text": "This is a whispered secret.",
         "instruct": "Speak in a low whisper",
     }
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
+    resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
     assert resp.status_code == 201
     assert resp.json()["draft"]["intensity"] is None
 
@@ -129,10 +149,8 @@ async def test_list_drafts_empty(client: AsyncClient, auth_headers: dict):
 
 
 @pytest.mark.asyncio
-async def test_list_drafts(client: AsyncClient, auth_headers: dict):
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
-        await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
+async def test_list_drafts(client: AsyncClient, auth_headers: dict, auth_user_id: str, make_drafts):
+    await make_drafts(auth_user_id, 2)
 
     resp = await client.get("/api/v1/drafts", headers=auth_headers)
     assert resp.status_code == 200
@@ -146,8 +164,7 @@ async def test_list_drafts(client: AsyncClient, auth_headers: dict):
 
 @pytest.mark.asyncio
 async def test_list_drafts_status_filter(client: AsyncClient, auth_headers: dict):
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
+    await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
 
     resp = await client.get("/api/v1/drafts?status=pending", headers=auth_headers)
     assert resp.status_code == 200
@@ -165,11 +182,12 @@ async def test_list_drafts_invalid_status_filter(client: AsyncClient, auth_heade
 
 
 @pytest.mark.asyncio
-async def test_list_drafts_character_filter(client: AsyncClient, auth_headers: dict):
+async def test_list_drafts_character_filter(
+    client: AsyncClient, auth_headers: dict, auth_user_id: str, make_drafts,
+):
     char_id = await _create_character(client, auth_headers)
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        await client.post("/api/v1/drafts", json={**DRAFT_PAYLOAD, "character_id": char_id}, headers=auth_headers)
-        await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
+    await make_drafts(auth_user_id, 1, character_id=char_id)
+    await make_drafts(auth_user_id, 1)
 
     resp = await client.get(f"/api/v1/drafts?character_id={char_id}", headers=auth_headers)
     assert resp.status_code == 200
@@ -181,8 +199,7 @@ async def test_list_drafts_character_filter(client: AsyncClient, auth_headers: d
 @pytest.mark.asyncio
 async def test_get_draft_includes_audio_field(client: AsyncClient, auth_headers: dict):
     """Full draft response should include audio_b64 key (even if None for pending)."""
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        create_resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
+    create_resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
     draft_id = create_resp.json()["draft"]["id"]
 
     resp = await client.get(f"/api/v1/drafts/{draft_id}", headers=auth_headers)
@@ -202,8 +219,7 @@ async def test_get_draft_not_found(client: AsyncClient, auth_headers: dict):
 
 @pytest.mark.asyncio
 async def test_delete_draft(client: AsyncClient, auth_headers: dict):
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        create_resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
+    create_resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
     draft_id = create_resp.json()["draft"]["id"]
 
     resp = await client.delete(f"/api/v1/drafts/{draft_id}", headers=auth_headers)
@@ -224,8 +240,7 @@ async def test_delete_draft_not_found(client: AsyncClient, auth_headers: dict):
 @pytest.mark.asyncio
 async def test_approve_pending_draft_fails(client: AsyncClient, auth_headers: dict):
     """Cannot approve a pending draft."""
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        create_resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
+    create_resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
     draft_id = create_resp.json()["draft"]["id"]
     char_id = await _create_character(client, auth_headers)
 
@@ -247,23 +262,21 @@ async def test_approve_ready_draft_creates_template(
     """Approving a ready draft creates a Template and sets draft.status=approved."""
     from web.app.models.draft import Draft, DRAFT_STATUS_READY
 
-    fake_audio_b64 = _make_fake_audio_b64()
     char_id = await _create_character(client, auth_headers)
 
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        create_resp = await client.post(
-            "/api/v1/drafts",
-            json={**DRAFT_PAYLOAD, "character_id": char_id},
-            headers=auth_headers,
-        )
+    create_resp = await client.post(
+        "/api/v1/drafts",
+        json={**DRAFT_PAYLOAD, "character_id": char_id},
+        headers=auth_headers,
+    )
     draft_id = create_resp.json()["draft"]["id"]
 
     # Set draft to ready with fake audio via test session
-    result = await db_session.execute(select(Draft).where(Draft.id == draft_id))
-    draft = result.scalar_one()
-    draft.status = DRAFT_STATUS_READY
-    draft.audio_b64 = fake_audio_b64
-    draft.duration_s = 1.0
+    await db_session.execute(
+        update(Draft)
+        .where(Draft.id == draft_id)
+        .values(status=DRAFT_STATUS_READY, audio_b64=FAKE_AUDIO_B64, duration_s=1.0)
+    )
     await db_session.commit()
 
     # Approve
@@ -288,16 +301,14 @@ async def test_approve_ready_draft_creates_template(
 
 @pytest.mark.asyncio
 async def test_regenerate_draft(client: AsyncClient, auth_headers: dict):
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        create_resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
+    create_resp = await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)
     draft_id = create_resp.json()["draft"]["id"]
 
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        resp = await client.post(
-            f"/api/v1/drafts/{draft_id}/regenerate",
-            json={"instruct": "Speak with extreme rage"},
-            headers=auth_headers,
-        )
+    resp = await client.post(
+        f"/api/v1/drafts/{draft_id}/regenerate",
+        json={"instruct": "Speak with extreme rage"},
+        headers=auth_headers,
+    )
     assert resp.status_code == 201
     new_draft = resp.json()["draft"]
     assert new_draft["id"] != draft_id  # new draft
@@ -312,15 +323,12 @@ async def test_regenerate_draft(client: AsyncClient, auth_headers: dict):
 # ── Isolation ─────────────────────────────────────────────────────────────────
 
 @pytest.mark.asyncio
-async def test_drafts_isolated_per_user(client: AsyncClient, auth_headers: dict):
+async def test_drafts_isolated_per_user(client: AsyncClient, auth_headers: dict, make_user):
     """User A cannot see User B's drafts."""
-    await client.post("/auth/register", json={"email": "b@b.com", "password": "password123"})
-    login_resp = await client.post("/auth/login", json={"email": "b@b.com", "password": "password123"})
-    headers_b = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+    headers_b = await make_user("b@b.com")
 
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)  # user A
-        await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=headers_b)     # user B
+    await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=auth_headers)  # user A
+    await client.post("/api/v1/drafts", json=DRAFT_PAYLOAD, headers=headers_b)     # user B
 
     resp_a = await client.get("/api/v1/drafts", headers=auth_headers)
     resp_b = await client.get("/api/v1/drafts", headers=headers_b)
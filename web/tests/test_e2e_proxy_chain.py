@@ -9,11 +9,32 @@ Verifies the FULL request path:
 All relay calls are mocked so no real GPU or RunPod is required.
 """
 
+from types import MappingProxyType
+
 import pytest
-from unittest.mock import AsyncMock, patch
 from httpx import AsyncClient
 
-PROXY_MODULE = "web.app.services.tts_proxy"
+from web.app.services.tts_proxy import TTSRelayError
+
+# Shared, read-only payloads. Pass copies (dict(...)) wherever the app or
+# httpx needs a real dict.
+RELAY_OK = MappingProxyType({"audio": "base64audio==", "format": "wav", "duration_s": 1.0})
+
+CAST_RELAY_RESPONSE = MappingProxyType({
+    "audio": "UklGRiQAAABXQVZFZm10IBAAAA==",
+    "format": "wav",
+    "duration_s": 1.5,
+    "name": "kira_joy_medium",   # GPU server returns the saved prompt name
+})
+
+CAST_PAYLOAD = MappingProxyType({
+    "text": "Joy is the word that comes to mind.",
+    "instruct": "Middle-aged woman, slightly husky, warm, joyful and exuberant",
+    "format": "wav",
+    "create_prompt": True,
+    "prompt_name": "kira_joy_medium",
+    "tags": ("kira", "joy", "medium"),
+})
 
 
 # ---------------------------------------------------------------------------
@@ -22,7 +43,9 @@ PROXY_MODULE = "web.app.services.tts_proxy"
 
 
 @pytest.mark.asyncio
-async def test_design_preview_full_chain_basic(client: AsyncClient, auth_headers: dict):
+async def test_design_preview_full_chain_basic(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
     """Frontend preview request flows correctly end-to-end.
 
     Simulates the exact payload CharacterPage sends for the ▶ Preview button:
@@ -36,16 +59,16 @@ async def test_design_preview_full_chain_basic(client: AsyncClient, auth_headers
         "duration_s": 1.5,
         "sample_rate": 24000,
     }
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock, return_value=relay_response) as mock_post:
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            json={
-                "text": "Hello world",
-                "instruct": "Adult woman, low pitch, husky voice",
-                "format": "wav",
-            },
-            headers=auth_headers,
-        )
+    mock_tts_post = mock_proxy("tts_post", relay_response)
+    resp = await client.post(
+        "/api/v1/tts/voices/design",
+        json={
+            "text": "Hello world",
+            "instruct": "Adult woman, low pitch, husky voice",
+            "format": "wav",
+        },
+        headers=auth_headers,
+    )
 
     assert resp.status_code == 200, f"Expected 200, got {resp.status_code}: {resp.text}"
     body = resp.json()
@@ -56,67 +79,57 @@ async def test_design_preview_full_chain_basic(client: AsyncClient, auth_headers
     assert body["format"] == "wav"
 
     # Verify relay was called with the correct endpoint path
-    mock_post.assert_called_once()
-    called_path = mock_post.call_args[0][0]
+    mock_tts_post.assert_called_once()
+    called_path = mock_tts_post.call_args[0][0]
     assert called_path == "/api/v1/voices/design", (
         f"Relay endpoint mismatch: got '{called_path}', "
         "expected '/api/v1/voices/design'"
     )
 
     # Verify request body forwarded to relay
-    called_body = mock_post.call_args[0][1]
+    called_body = mock_tts_post.call_args[0][1]
     assert called_body["text"] == "Hello world"
     assert called_body["instruct"] == "Adult woman, low pitch, husky voice"
     assert called_body["format"] == "wav"
 
 
 @pytest.mark.asyncio
-async def test_design_preview_language_default(client: AsyncClient, auth_headers: dict):
+async def test_design_preview_language_default(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
     """language defaults to 'English' when not specified by frontend."""
-    relay_response = {"audio": "base64audio==", "format": "wav", "duration_s": 1.0}
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock, return_value=relay_response) as mock_post:
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            # Frontend omits language — relay default kicks in
-            json={"text": "Test", "instruct": "Deep voice"},
-            headers=auth_headers,
-        )
+    mock_tts_post = mock_proxy("tts_post", dict(RELAY_OK))
+    resp = await client.post(
+        "/api/v1/tts/voices/design",
+        # Frontend omits language — relay default kicks in
+        json={"text": "Test", "instruct": "Deep voice"},
+        headers=auth_headers,
+    )
     assert resp.status_code == 200
-    called_body = mock_post.call_args[0][1]
+    called_body = mock_tts_post.call_args[0][1]
     assert called_body.get("language") == "English", (
         "language must default to 'English' when not specified by frontend"
     )
 
 
 @pytest.mark.asyncio
-async def test_design_preview_relay_502_becomes_502(client: AsyncClient, auth_headers: dict):
-    """Relay error surfaces as HTTP 502 with detail, not a raw 500."""
-    from web.app.services.tts_proxy import TTSRelayError
-
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock) as mock_post:
-        mock_post.side_effect = TTSRelayError(502, "RunPod error: worker crashed")
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            json={"text": "Hello", "instruct": "Deep voice"},
-            headers=auth_headers,
-        )
-    assert resp.status_code == 502
-    assert "RunPod" in resp.json()["detail"]
-
-
-@pytest.mark.asyncio
-async def test_design_preview_relay_504_becomes_504(client: AsyncClient, auth_headers: dict):
-    """504 timeout from relay propagates as 504."""
-    from web.app.services.tts_proxy import TTSRelayError
-
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock) as mock_post:
-        mock_post.side_effect = TTSRelayError(504, "TTS relay timed out — GPU may be cold-starting")
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            json={"text": "Hello", "instruct": "Deep voice"},
-            headers=auth_headers,
-        )
-    assert resp.status_code == 504
+@pytest.mark.parametrize("status,msg", [
+    (502, "RunPod error: worker crashed"),
+    (504, "TTS relay timed out — GPU may be cold-starting"),
+])
+async def test_design_preview_relay_error_propagates(
+    client: AsyncClient, auth_headers: dict, mock_proxy, status: int, msg: str,
+):
+    """Relay errors surface with their own status and detail, not a raw 500."""
+    mock_tts_post = mock_proxy("tts_post")
+    mock_tts_post.side_effect = TTSRelayError(status, msg)
+    resp = await client.post(
+        "/api/v1/tts/voices/design",
+        json={"text": "Hello", "instruct": "Deep voice"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == status
+    assert resp.json()["detail"] == msg
 
 
 # ---------------------------------------------------------------------------
@@ -125,38 +138,26 @@ async def test_design_preview_relay_504_becomes_504(client: AsyncClient, auth_he
 
 
 @pytest.mark.asyncio
-async def test_cast_single_create_prompt_passes_through(client: AsyncClient, auth_headers: dict):
+async def test_cast_single_create_prompt_passes_through(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
     """Cast button sends create_prompt/prompt_name/tags — all must reach the relay.
 
     Bug: DesignRequest model previously only had {text, instruct, language, format}.
     The extra fields were silently dropped by Pydantic, so the GPU never saved
     the clone prompt.  Fix: add optional create_prompt/prompt_name/tags to the model.
     """
-    relay_response = {
-        "audio": "UklGRiQAAABXQVZFZm10IBAAAA==",
-        "format": "wav",
-        "duration_s": 1.5,
-        "name": "kira_joy_medium",   # GPU server returns the saved prompt name
-    }
-    cast_payload = {
-        "text": "Joy is the word that comes to mind.",
-        "instruct": "Middle-aged woman, slightly husky, warm, joyful and exuberant",
-        "format": "wav",
-        "create_prompt": True,
-        "prompt_name": "kira_joy_medium",
-        "tags": ["kira", "joy", "medium"],
-    }
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock, return_value=relay_response) as mock_post:
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            json=cast_payload,
-            headers=auth_headers,
-        )
+    mock_tts_post = mock_proxy("tts_post", dict(CAST_RELAY_RESPONSE))
+    resp = await client.post(
+        "/api/v1/tts/voices/design",
+        json=dict(CAST_PAYLOAD),
+        headers=auth_headers,
+    )
 
     assert resp.status_code == 200, f"Expected 200, got {resp.status_code}: {resp.text}"
 
-    mock_post.assert_called_once()
-    called_body = mock_post.call_args[0][1]
+    mock_tts_post.assert_called_once()
+    called_body = mock_tts_post.call_args[0][1]
 
     # These are the critical fields that were previously dropped
     assert called_body.get("create_prompt") is True, (
@@ -170,25 +171,26 @@ async def test_cast_single_create_prompt_passes_through(client: AsyncClient, aut
     )
 
     # Core fields still present
-    assert called_body["text"] == cast_payload["text"]
-    assert called_body["instruct"] == cast_payload["instruct"]
+    assert called_body["text"] == CAST_PAYLOAD["text"]
+    assert called_body["instruct"] == CAST_PAYLOAD["instruct"]
 
 
 @pytest.mark.asyncio
-async def test_cast_no_create_prompt_excludes_field(client: AsyncClient, auth_headers: dict):
+async def test_cast_no_create_prompt_excludes_field(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
     """When create_prompt is omitted, the relay body should not include it.
 
     Uses exclude_none=True so relay body stays clean for plain preview calls.
     """
-    relay_response = {"audio": "base64audio==", "format": "wav", "duration_s": 1.0}
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock, return_value=relay_response) as mock_post:
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            json={"text": "Hello", "instruct": "Deep voice", "format": "wav"},
-            headers=auth_headers,
-        )
+    mock_tts_post = mock_proxy("tts_post", dict(RELAY_OK))
+    resp = await client.post(
+        "/api/v1/tts/voices/design",
+        json={"text": "Hello", "instruct": "Deep voice", "format": "wav"},
+        headers=auth_headers,
+    )
     assert resp.status_code == 200
-    called_body = mock_post.call_args[0][1]
+    called_body = mock_tts_post.call_args[0][1]
     assert "create_prompt" not in called_body, "create_prompt should be absent for plain previews"
     assert "prompt_name" not in called_body, "prompt_name should be absent for plain previews"
     assert "tags" not in called_body, "tags should be absent for plain previews"
@@ -200,22 +202,23 @@ async def test_cast_no_create_prompt_excludes_field(client: AsyncClient, auth_he
 
 
 @pytest.mark.asyncio
-async def test_relay_design_endpoint_correct_path(client: AsyncClient, auth_headers: dict):
+async def test_relay_design_endpoint_correct_path(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
     """Web proxy must call relay at /api/v1/voices/design (not /api/v1/tts/voices/design).
 
     The relay registers the route as POST /api/v1/voices/design.
     The web proxy must strip the /tts prefix before forwarding.
     """
-    relay_response = {"audio": "testbase64==", "format": "wav", "duration_s": 0.5}
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock, return_value=relay_response) as mock_post:
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            json={"text": "Test", "instruct": "Voice instruction"},
-            headers=auth_headers,
-        )
+    mock_tts_post = mock_proxy("tts_post", dict(RELAY_OK))
+    resp = await client.post(
+        "/api/v1/tts/voices/design",
+        json={"text": "Test", "instruct": "Voice instruction"},
+        headers=auth_headers,
+    )
     assert resp.status_code == 200
 
-    called_path = mock_post.call_args[0][0]
+    called_path = mock_tts_post.call_args[0][0]
     # Web proxy route calls tts_proxy.tts_post("/api/v1/voices/design", ...)
     # NOT "/api/v1/tts/voices/design" — that would 404 on the relay
     assert called_path == "/api/v1/voices/design", (
@@ -231,7 +234,9 @@ async def test_relay_design_endpoint_correct_path(client: AsyncClient, auth_head
 
 
 @pytest.mark.asyncio
-async def test_design_body_transformation_complete(client: AsyncClient, auth_headers: dict):
+async def test_design_body_transformation_complete(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
     """All fields transform correctly through the proxy chain.
 
     Frontend body → Pydantic validation → relay body:
@@ -243,7 +248,6 @@ async def test_design_body_transformation_complete(client: AsyncClient, auth_hea
     - prompt_name: str | None (optional, must pass-through if set)
     - tags: list[str] | None (optional, must pass-through if set)
     """
-    relay_response = {"audio": "abc123==", "format": "wav", "duration_s": 2.0}
     frontend_payload = {
         "text": "She laughed softly.",
         "instruct": "Warm feminine voice, 35-year-old, slightly breathless",
@@ -253,18 +257,14 @@ async def test_design_body_transformation_complete(client: AsyncClient, auth_hea
         "prompt_name": "elena_base",
         "tags": ["elena", "neutral", "base"],
     }
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock, return_value=relay_response) as mock_post:
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            json=frontend_payload,
-            headers=auth_headers,
-        )
+    mock_tts_post = mock_proxy("tts_post", dict(RELAY_OK))
+    resp = await client.post(
+        "/api/v1/tts/voices/design",
+        json=frontend_payload,
+        headers=auth_headers,
+    )
     assert resp.status_code == 200
-    called_body = mock_post.call_args[0][1]
-
-    for field in ["text", "instruct", "language", "format", "create_prompt", "prompt_name", "tags"]:
-        assert field in called_body, f"Field '{field}' missing from relay call body"
-        assert called_body[field] == frontend_payload[field], (
-            f"Field '{field}' value mismatch: got {called_body[field]!r}, "
-            f"expected {frontend_payload[field]!r}"
-        )
+    called_body = mock_tts_post.call_args[0][1]
+
+    forwarded = {k: called_body.get(k) for k in frontend_payload}
+    assert forwarded == frontend_payload, "Relay call body dropped or altered frontend fields"
@@ -1,21 +1,45 @@
 """Tests for security utilities (JWT, password hashing)."""
 
+import hmac
+from unittest.mock import patch
+
 import pytest
+
+from web.app.core import security
 from web.app.core.security import (
+    clear_token_cache,
     create_access_token,
     create_refresh_token,
     create_reset_token,
     decode_token,
     hash_password,
+    password_needs_rehash,
+    pwd_context,
     verify_password,
 )
 
 
 def test_password_hash_and_verify():
     hashed = hash_password("mysecret")
-    assert hashed != "mysecret"
+    assert hashed.startswith("$argon2id$")
     assert verify_password("mysecret", hashed)
     assert not verify_password("wrong", hashed)
+    assert not password_needs_rehash(hashed)
+
+
+def test_legacy_bcrypt_hash_verifies_and_needs_rehash():
+    from passlib.hash import bcrypt
+
+    legacy = bcrypt.using(rounds=4).hash("mysecret")
+    assert verify_password("mysecret", legacy)
+    assert password_needs_rehash(legacy)
+
+
+def test_argon2_hash_with_other_params_does_not_need_rehash():
+    argon2 = pwd_context.handler("argon2")
+    other = argon2.using(time_cost=2, memory_cost=16, parallelism=2).hash("mysecret")
+    assert verify_password("mysecret", other)
+    assert not password_needs_rehash(other)
 
 
 def test_access_token():
@@ -46,3 +70,24 @@ def test_invalid_token():
 def test_wrong_type_rejected():
     token = create_access_token("user-1")
     assert decode_token(token, expected_type="refresh") is None
+
+
+def test_decode_token_served_from_cache():
+    clear_token_cache()
+    token = create_access_token("user-cached")
+    assert decode_token(token) == "user-cached"
+
+    with patch.object(security.jwt, "decode", side_effect=AssertionError("re-verified")):
+        assert decode_token(token) == "user-cached"
+        # The type is part of the key: a cached access token is not a refresh token
+        with pytest.raises(AssertionError):
+            decode_token(token, expected_type="refresh")
+
+
+def test_token_type_check_is_constant_time():
+    clear_token_cache()
+    token = create_refresh_token("user-ct")
+    with patch.object(security.hmac, "compare_digest", wraps=hmac.compare_digest) as cmp:
+        assert decode_token(token, expected_type="access") is None
+        assert decode_token(token, expected_type="refresh") == "user-ct"
+    assert cmp.call_count == 2
@@ -1,28 +1,42 @@
 """Tests for template management routes."""
 
 import base64
-import io
 import struct
-import wave
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from web.app.routes import drafts as drafts_routes
 
-def _make_fake_audio_b64() -> str:
-    """Generate a minimal valid WAV file and return as base64."""
+
+def _build_fake_audio_b64() -> str:
+    """Build a one-second silent mono 16-bit WAV and return it as base64.
+
+    The 44-byte RIFF/WAVE header is packed by hand; samples are zero bytes.
+    """
     sample_rate = 22050
-    num_samples = sample_rate  # 1 second
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(struct.pack(f"<{num_samples}h", *([0] * num_samples)))
-    return base64.b64encode(buf.getvalue()).decode()
+    data = bytes(sample_rate * 2)
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(data), b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", len(data),
+    )
+    return base64.b64encode(header + data).decode()
+
+
+FAKE_AUDIO_B64 = _build_fake_audio_b64()
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _mock_generate():
+    """Never run background audio generation — it would call the GPU relay."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(drafts_routes, "_generate_draft_audio", AsyncMock())
+        yield
 
 
 async def _create_character(client: AsyncClient, auth_headers: dict, name: str = "Kira") -> str:
@@ -61,18 +75,16 @@ async def _create_ready_draft(
             "instruct": "Speak in a low whisper",
         }
 
-    with patch("web.app.routes.drafts._generate_draft_audio", new_callable=AsyncMock):
-        resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
+    resp = await client.post("/api/v1/drafts", json=payload, headers=auth_headers)
     assert resp.status_code == 201
     draft_id = resp.json()["draft"]["id"]
 
     # Set to ready with fake audio using test session
-    fake_audio = _make_fake_audio_b64()
-    result = await db_session.execute(select(Draft).where(Draft.id == draft_id))
-    draft = result.scalar_one()
-    draft.status = DRAFT_STATUS_READY
-    draft.audio_b64 = fake_audio
-    draft.duration_s = 1.0
+    await db_session.execute(
+        update(Draft)
+        .where(Draft.id == draft_id)
+        .values(status=DRAFT_STATUS_READY, audio_b64=FAKE_AUDIO_B64, duration_s=1.0)
+    )
     await db_session.commit()
 
     return draft_id
@@ -281,10 +293,9 @@ async def test_templates_isolated_per_user(
     client: AsyncClient,
     auth_headers: dict,
     db_session: AsyncSession,
+    make_user,
 ):
-    await client.post("/auth/register", json={"email": "c@c.com", "password": "password123"})
-    login_resp = await client.post("/auth/login", json={"email": "c@c.com", "password": "password123"})
-    headers_c = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+    headers_c = await make_user("c@c.com")
 
     # User A creates a template
     char_a = await _create_character(client, auth_headers, "Char A")
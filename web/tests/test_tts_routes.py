@@ -1,30 +1,30 @@
 """Tests for TTS proxy routes — /api/v1/tts/*.
 
-All relay calls are mocked via monkeypatching tts_proxy functions.
+Relay calls are mocked either at the tts_proxy function boundary
+(``mock_proxy``) or at the httpx transport (``relay_mock``).
 """
 
 import pytest
-from unittest.mock import AsyncMock, patch
 from httpx import AsyncClient
 
+from web.app.services import tts_proxy
+from web.app.services.tts_proxy import TTSRelayError, tts_post
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-PROXY_MODULE = "web.app.services.tts_proxy"
+# Shared relay fixtures — treat as read-only.
+_RELAY_STATUS_PAYLOAD = {
+    "status": "ok",
+    "tunnel_connected": False,
+    "models_loaded": [],
+    "prompts_count": 0,
+    "runpod_configured": True,
+    "runpod_available": True,
+}
 
-
-def mock_tts_get(return_value):
-    return patch(f"{PROXY_MODULE}.tts_get", new_callable=AsyncMock, return_value=return_value)
-
-
-def mock_tts_post(return_value):
-    return patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock, return_value=return_value)
-
-
-def mock_tts_delete(return_value):
-    return patch(f"{PROXY_MODULE}.tts_delete", new_callable=AsyncMock, return_value=return_value)
+_FAKE_WAV_BYTES = b"RIFF\x24\x00\x00\x00WAVEfmt \x10\x00\x00\x00"
 
 
 # ---------------------------------------------------------------------------
@@ -32,19 +32,16 @@ def mock_tts_delete(return_value):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_status_requires_auth(client: AsyncClient):
     resp = await client.get("/api/v1/tts/status")
     assert resp.status_code == 401
 
 
-@pytest.mark.asyncio
 async def test_design_requires_auth(client: AsyncClient):
     resp = await client.post("/api/v1/tts/voices/design", json={"text": "hi", "instruct": "deep"})
     assert resp.status_code == 401
 
 
-@pytest.mark.asyncio
 async def test_synthesize_requires_auth(client: AsyncClient):
     resp = await client.post("/api/v1/tts/synthesize", json={"voice_prompt": "x", "text": "hi"})
     assert resp.status_code == 401
@@ -55,43 +52,33 @@ async def test_synthesize_requires_auth(client: AsyncClient):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_status_proxies_to_relay(client: AsyncClient, auth_headers: dict):
+async def test_status_proxies_to_relay(client: AsyncClient, auth_headers: dict, relay_mock):
     # Proxy must call /api/v1/tts/status (the frontend-designed endpoint that
     # returns runpod_configured/runpod_available). Calling the older /api/v1/status
     # omitted those fields before commit 530c0c2, causing "No GPU Backend" even
     # when RunPod was configured.
-    relay_payload = {
-        "status": "ok",
-        "tunnel_connected": False,
-        "models_loaded": [],
-        "prompts_count": 0,
-        "runpod_configured": True,
-        "runpod_available": True,
-    }
-    with mock_tts_get(relay_payload) as m:
-        resp = await client.get("/api/v1/tts/status", headers=auth_headers)
+    relay_mock.expect("/api/v1/tts/status", _RELAY_STATUS_PAYLOAD)
+    resp = await client.get("/api/v1/tts/status", headers=auth_headers)
     assert resp.status_code == 200
     body = resp.json()
     assert body["status"] == "ok"
     assert body["runpod_configured"] is True
     assert body["runpod_available"] is True
-    m.assert_called_once_with("/api/v1/tts/status")
+    assert [r.url.path for r in relay_mock.calls] == ["/api/v1/tts/status"]
 
 
-@pytest.mark.asyncio
-async def test_status_degraded_when_relay_unreachable(client: AsyncClient, auth_headers: dict):
+async def test_status_degraded_when_relay_unreachable(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
     """When relay is down, status returns degraded response with runpod_configured=False.
 
     This ensures the frontend shows 'No GPU Backend' (not an unhandled error)
     and doesn't incorrectly imply RunPod is configured when the relay is
     unreachable (fixing the missing runpod_configured key in the error fallback).
     """
-    from web.app.services.tts_proxy import TTSRelayError
-
     error = TTSRelayError(502, "Cannot connect to TTS relay — server may be down")
-    with patch(f"{PROXY_MODULE}.tts_get", new_callable=AsyncMock, side_effect=error):
-        resp = await client.get("/api/v1/tts/status", headers=auth_headers)
+    mock_proxy("tts_get").side_effect = error
+    resp = await client.get("/api/v1/tts/status", headers=auth_headers)
 
     assert resp.status_code == 200  # status endpoint never returns 5xx — returns degraded payload
     body = resp.json()
@@ -102,46 +89,89 @@ async def test_status_degraded_when_relay_unreachable(client: AsyncClient, auth_
     assert "error" in body
 
 
-@pytest.mark.asyncio
-async def test_list_characters(client: AsyncClient, auth_headers: dict):
-    with mock_tts_get({"characters": ["kira", "marcus"]}) as m:
-        resp = await client.get("/api/v1/tts/voices/characters", headers=auth_headers)
+@pytest.mark.parametrize("url,relay_path,relay_body", [
+    (
+        "/api/v1/tts/voices/characters",
+        "/api/v1/voices/characters",
+        {"characters": ["kira", "marcus"]},
+    ),
+    ("/api/v1/tts/voices/emotions", "/api/v1/voices/emotions", {"emotions": [], "modes": []}),
+    ("/api/v1/tts/voices/prompts", "/api/v1/voices/prompts", {"prompts": []}),
+    ("/api/v1/tts/voices/prompts?tags=kira", "/api/v1/voices/prompts?tags=kira", {"prompts": []}),
+    ("/api/v1/tts/voices/v1/package", "/api/v1/tts/voices/v1/package", {"voice_id": "v1"}),
+])
+async def test_conditional_get_proxies_to_relay(
+    client: AsyncClient, auth_headers: dict, relay_mock,
+    url: str, relay_path: str, relay_body: dict,
+):
+    relay_mock.expect(relay_path.partition("?")[0], relay_body)
+    resp = await client.get(url, headers=auth_headers)
     assert resp.status_code == 200
-    assert "kira" in resp.json()["characters"]
-    m.assert_called_once_with("/api/v1/voices/characters")
+    assert resp.json() == relay_body
+    assert resp.headers["etag"].startswith('W/"')
+    (request,) = relay_mock.calls
+    assert request.url.raw_path == relay_path.encode()
+    assert "if-none-match" not in request.headers
 
 
-@pytest.mark.asyncio
-async def test_list_emotions(client: AsyncClient, auth_headers: dict):
-    with mock_tts_get({"emotions": [], "modes": []}) as m:
-        resp = await client.get("/api/v1/tts/voices/emotions", headers=auth_headers)
+async def test_list_characters_sets_etag(client: AsyncClient, auth_headers: dict, mock_proxy):
+    mock_proxy("tts_get_conditional", ({"characters": []}, 'W/"abc"'))
+    resp = await client.get("/api/v1/tts/voices/characters", headers=auth_headers)
     assert resp.status_code == 200
-    m.assert_called_once_with("/api/v1/voices/emotions")
+    assert resp.headers["etag"] == 'W/"abc"'
 
 
-@pytest.mark.asyncio
-async def test_list_prompts_no_filter(client: AsyncClient, auth_headers: dict):
-    with mock_tts_get({"prompts": []}) as m:
-        resp = await client.get("/api/v1/tts/voices/prompts", headers=auth_headers)
-    assert resp.status_code == 200
-    m.assert_called_once_with("/api/v1/voices/prompts")
+async def test_list_characters_not_modified(client: AsyncClient, auth_headers: dict, mock_proxy):
+    headers = {**auth_headers, "If-None-Match": 'W/"abc"'}
+    m = mock_proxy("tts_get_conditional", (None, 'W/"abc"'))
+    resp = await client.get("/api/v1/tts/voices/characters", headers=headers)
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == 'W/"abc"'
+    m.assert_called_once_with("/api/v1/voices/characters", 'W/"abc"')
 
 
-@pytest.mark.asyncio
-async def test_list_prompts_with_tags(client: AsyncClient, auth_headers: dict):
-    with mock_tts_get({"prompts": []}) as m:
-        resp = await client.get("/api/v1/tts/voices/prompts?tags=kira", headers=auth_headers)
-    assert resp.status_code == 200
-    m.assert_called_once_with("/api/v1/voices/prompts?tags=kira")
+async def test_tts_get_conditional_derives_etag_when_relay_sends_none(relay_mock):
+    """Without a relay ETag, a body hash is used and revalidates to a 304."""
+    relay_mock.expect("/api/v1/voices/characters", {"characters": ["kira"]})
+
+    data, etag = await tts_proxy.tts_get_conditional("/api/v1/voices/characters")
+    assert data == {"characters": ["kira"]}
+    assert etag.startswith('W/"')
 
+    again, same = await tts_proxy.tts_get_conditional("/api/v1/voices/characters", etag)
+    assert again is None
+    assert same == etag
+    assert relay_mock.calls[-1].headers["if-none-match"] == etag
 
-@pytest.mark.asyncio
-async def test_search_prompts(client: AsyncClient, auth_headers: dict):
-    with mock_tts_get({"prompts": []}) as m:
-        resp = await client.get(
-            "/api/v1/tts/voices/prompts/search?character=kira&emotion=joy",
-            headers=auth_headers,
-        )
+
+async def test_tts_get_conditional_relay_304(relay_mock):
+    relay_mock.expect("/api/v1/voices/emotions", status=304, headers={"etag": '"r1"'})
+
+    data, etag = await tts_proxy.tts_get_conditional("/api/v1/voices/emotions", '"r1"')
+    assert data is None
+    assert etag == '"r1"'
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [('"r1"', '"r1"'), ('"r1", "r2"', None), ("*", None)],
+)
+async def test_tts_get_conditional_relay_304_without_etag(relay_mock, if_none_match, expected):
+    """A bare relay 304 never echoes a tag list or ``*`` back as the ETag."""
+    relay_mock.expect("/api/v1/voices/emotions", status=304)
+
+    data, etag = await tts_proxy.tts_get_conditional("/api/v1/voices/emotions", if_none_match)
+    assert data is None
+    assert etag == expected
+
+
+async def test_search_prompts(client: AsyncClient, auth_headers: dict, mock_proxy):
+    m = mock_proxy("tts_get", {"prompts": []})
+    resp = await client.get(
+        "/api/v1/tts/voices/prompts/search?character=kira&emotion=joy",
+        headers=auth_headers,
+    )
     assert resp.status_code == 200
     call_path = m.call_args[0][0]
     assert "character=kira" in call_path
@@ -153,14 +183,13 @@ async def test_search_prompts(client: AsyncClient, auth_headers: dict):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_design_voice(client: AsyncClient, auth_headers: dict):
-    with mock_tts_post({"audio": "base64data", "duration": 2.5}) as m:
-        resp = await client.post(
-            "/api/v1/tts/voices/design",
-            json={"text": "Hello world", "instruct": "Deep male voice"},
-            headers=auth_headers,
-        )
+async def test_design_voice(client: AsyncClient, auth_headers: dict, mock_proxy):
+    m = mock_proxy("tts_post", {"audio": "base64data", "duration": 2.5})
+    resp = await client.post(
+        "/api/v1/tts/voices/design",
+        json={"text": "Hello world", "instruct": "Deep male voice"},
+        headers=auth_headers,
+    )
     assert resp.status_code == 200
     assert resp.json()["audio"] == "base64data"
     m.assert_called_once()
@@ -168,65 +197,113 @@ async def test_design_voice(client: AsyncClient, auth_headers: dict):
     assert call_body["text"] == "Hello world"
 
 
-@pytest.mark.asyncio
-async def test_cast_voice(client: AsyncClient, auth_headers: dict):
-    with mock_tts_post({"results": []}) as m:
-        resp = await client.post(
-            "/api/v1/tts/voices/cast",
-            json={"character": "kira", "description": "husky woman"},
-            headers=auth_headers,
-        )
+@pytest.mark.parametrize("url,payload,relay_path", [
+    (
+        "/api/v1/tts/voices/cast",
+        {"character": "kira", "description": "husky woman"},
+        "/api/v1/voices/cast",
+    ),
+    (
+        "/api/v1/tts/voices/design/batch",
+        {"items": [{"name": "t", "text": "hi", "instruct": "deep"}]},
+        "/api/v1/voices/design/batch",
+    ),
+    (
+        "/api/v1/tts/voices/clone-prompt",
+        {"audio": "base64audio", "name": "kira_base"},
+        "/api/v1/voices/clone-prompt",
+    ),
+    (
+        "/api/v1/tts/audio/normalize",
+        {"audio": "b64in", "ref_audio": "b64ref"},
+        "/api/v1/audio/normalize",
+    ),
+])
+async def test_post_proxies_to_relay(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+    url: str, payload: dict, relay_path: str,
+):
+    m = mock_proxy("tts_post", {"status": "ok"})
+    resp = await client.post(url, json=payload, headers=auth_headers)
     assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
     m.assert_called_once()
+    assert m.call_args[0][0] == relay_path
 
 
-@pytest.mark.asyncio
-async def test_synthesize(client: AsyncClient, auth_headers: dict):
-    with mock_tts_post({"audio": "b64", "duration": 1.0}) as m:
-        resp = await client.post(
-            "/api/v1/tts/synthesize",
-            json={"voice_prompt": "kira_joy_medium", "text": "Hello"},
-            headers=auth_headers,
-        )
+async def test_synthesize(client: AsyncClient, auth_headers: dict, mock_proxy):
+    m = mock_proxy("tts_post_passthrough", {"audio": "b64", "duration": 1.0})
+    resp = await client.post(
+        "/api/v1/tts/synthesize",
+        json={"voice_prompt": "kira_joy_medium", "text": "Hello"},
+        headers=auth_headers,
+    )
     assert resp.status_code == 200
     m.assert_called_once()
     assert m.call_args[0][0] == "/api/v1/tts/clone-prompt"
 
 
-@pytest.mark.asyncio
-async def test_batch_design(client: AsyncClient, auth_headers: dict):
-    with mock_tts_post({"results": [{"name": "test", "status": "ok"}]}) as m:
-        resp = await client.post(
-            "/api/v1/tts/voices/design/batch",
-            json={"items": [{"name": "t", "text": "hi", "instruct": "deep"}]},
-            headers=auth_headers,
-        )
-    assert resp.status_code == 200
-    m.assert_called_once()
+async def test_synthesize_forwards_raw_body(client: AsyncClient, auth_headers: dict, relay_mock):
+    """The synthesize body reaches the relay byte-for-byte, without re-encoding."""
+    raw = b'{"voice_prompt": "kira_joy_medium", "text": "Hello", "language": "German"}'
+    relay_mock.expect("/api/v1/tts/clone-prompt", {"audio": "b64", "format": "wav"})
 
+    resp = await client.post(
+        "/api/v1/tts/synthesize",
+        content=raw,
+        headers={**auth_headers, "content-type": "application/json"},
+    )
 
-@pytest.mark.asyncio
-async def test_create_clone_prompt(client: AsyncClient, auth_headers: dict):
-    with mock_tts_post({"name": "kira_base", "status": "created"}) as m:
-        resp = await client.post(
-            "/api/v1/tts/voices/clone-prompt",
-            json={"audio": "base64audio", "name": "kira_base"},
-            headers=auth_headers,
-        )
     assert resp.status_code == 200
-    m.assert_called_once()
+    assert resp.json()["audio"] == "b64"
+    (request,) = relay_mock.calls
+    assert request.url.path == "/api/v1/tts/clone-prompt"
+    assert request.content == raw
 
 
-@pytest.mark.asyncio
-async def test_normalize_audio(client: AsyncClient, auth_headers: dict):
-    with mock_tts_post({"audio": "normalized_b64"}) as m:
-        resp = await client.post(
-            "/api/v1/tts/audio/normalize",
-            json={"audio": "b64in", "ref_audio": "b64ref"},
-            headers=auth_headers,
-        )
-    assert resp.status_code == 200
-    m.assert_called_once()
+async def test_synthesize_rejects_non_json_body(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
+    m = mock_proxy("tts_post_passthrough")
+    resp = await client.post(
+        "/api/v1/tts/synthesize",
+        content=b"voice_prompt=kira&text=Hello",
+        headers={**auth_headers, "content-type": "application/x-www-form-urlencoded"},
+    )
+    assert resp.status_code == 415
+    assert m.call_count == 0
+
+
+async def test_synthesize_rejects_oversized_body(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
+    m = mock_proxy("tts_post_passthrough")
+    resp = await client.post(
+        "/api/v1/tts/synthesize",
+        json={"voice_prompt": "kira_joy_medium", "text": "x" * (1024 * 1024)},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 413
+    assert m.call_count == 0
+
+
+async def test_synthesize_rejects_oversized_streamed_body(
+    client: AsyncClient, auth_headers: dict, mock_proxy,
+):
+    """Without a Content-Length the limit still applies while the body streams in."""
+    m = mock_proxy("tts_post_passthrough")
+
+    async def chunks():
+        for _ in range(4):
+            yield b"x" * (512 * 1024)
+
+    resp = await client.post(
+        "/api/v1/tts/synthesize",
+        content=chunks(),
+        headers={**auth_headers, "content-type": "application/json"},
+    )
+    assert resp.status_code == 413
+    assert m.call_count == 0
 
 
 # ---------------------------------------------------------------------------
@@ -234,12 +311,13 @@ async def test_normalize_audio(client: AsyncClient, auth_headers: dict):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_delete_prompt(client: AsyncClient, auth_headers: dict):
-    with mock_tts_delete({"deleted": True}) as m:
-        resp = await client.delete("/api/v1/tts/voices/prompts/kira_joy_medium", headers=auth_headers)
+async def test_delete_prompt(client: AsyncClient, auth_headers: dict, relay_mock):
+    relay_mock.expect("/api/v1/voices/prompts/kira_joy_medium", {"deleted": True})
+    resp = await client.delete("/api/v1/tts/voices/prompts/kira_joy_medium", headers=auth_headers)
     assert resp.status_code == 200
-    m.assert_called_once_with("/api/v1/voices/prompts/kira_joy_medium")
+    (request,) = relay_mock.calls
+    assert request.method == "DELETE"
+    assert request.url.path == "/api/v1/voices/prompts/kira_joy_medium"
 
 
 # ---------------------------------------------------------------------------
@@ -247,7 +325,6 @@ async def test_delete_prompt(client: AsyncClient, auth_headers: dict):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_import_package_not_implemented(client: AsyncClient, auth_headers: dict):
     resp = await client.post("/api/v1/tts/voices/import", headers=auth_headers)
     assert resp.status_code == 501
@@ -258,57 +335,41 @@ async def test_import_package_not_implemented(client: AsyncClient, auth_headers:
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_tts_post_raises_502_on_binary_response(client: AsyncClient, auth_headers: dict):
+async def test_tts_post_raises_502_on_binary_response(relay_mock):
     """tts_proxy.tts_post must raise TTSRelayError(502), not JSONDecodeError,
     when the relay returns an unexpected binary/non-JSON response.
 
     This prevents a raw JSONDecodeError from bubbling up as HTTP 500.
     The fix wraps resp.json() in a try/except and surfaces a clear 502.
     """
-    from web.app.services.tts_proxy import TTSRelayError, tts_post
-    import httpx
-
-    binary_content = b"RIFF\x24\x00\x00\x00WAVEfmt \x10\x00\x00\x00"
-    fake_resp = httpx.Response(
-        status_code=200,
-        headers={"content-type": "audio/wav"},
-        content=binary_content,
-        request=httpx.Request("POST", "http://localhost:9800/api/v1/tts/clone-prompt"),
+    relay_mock.expect(
+        "/api/v1/tts/clone-prompt", content=_FAKE_WAV_BYTES, headers={"content-type": "audio/wav"},
     )
 
-    with patch(f"{PROXY_MODULE}._get_client") as mock_get_client:
-        mock_client = AsyncMock()
-        mock_client.post = AsyncMock(return_value=fake_resp)
-        mock_get_client.return_value = mock_client
-
-        with pytest.raises(TTSRelayError) as exc_info:
-            await tts_post("/api/v1/tts/clone-prompt", {"voice_prompt": "kira", "text": "Hi"})
+    with pytest.raises(TTSRelayError) as exc_info:
+        await tts_post("/api/v1/tts/clone-prompt", {"voice_prompt": "kira", "text": "Hi"})
 
     assert exc_info.value.status_code == 502
     assert "audio/wav" in exc_info.value.detail or "binary" in exc_info.value.detail.lower()
 
 
-@pytest.mark.asyncio
 async def test_synthesize_returns_503_when_relay_returns_tunnel_required(
-    client: AsyncClient, auth_headers: dict
+    client: AsyncClient, auth_headers: dict, mock_proxy,
 ):
     """POST /api/v1/tts/synthesize should surface 503 with clear message
     when the relay returns 503 tunnel_required (tunnel offline).
     """
-    from web.app.services.tts_proxy import TTSRelayError
-
-    with patch(f"{PROXY_MODULE}.tts_post", new_callable=AsyncMock) as mock_post:
-        mock_post.side_effect = TTSRelayError(
-            503,
-            "Clone-prompt synthesis requires the local GPU to be connected. "
-            "Daniel's GPU tunnel is currently offline.",
-        )
-        resp = await client.post(
-            "/api/v1/tts/synthesize",
-            json={"voice_prompt": "kira_joy_medium", "text": "Hello"},
-            headers=auth_headers,
-        )
+    mock_post = mock_proxy("tts_post_passthrough")
+    mock_post.side_effect = TTSRelayError(
+        503,
+        "Clone-prompt synthesis requires the local GPU to be connected. "
+        "Daniel's GPU tunnel is currently offline.",
+    )
+    resp = await client.post(
+        "/api/v1/tts/synthesize",
+        json={"voice_prompt": "kira_joy_medium", "text": "Hello"},
+        headers=auth_headers,
+    )
 
     assert resp.status_code == 503
     body = resp.json()